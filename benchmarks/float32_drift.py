@@ -0,0 +1,62 @@
+import os
+import sys
+
+import numpy as np
+
+# Accuracy check for MoldSimulation(precision="float32"): for a few fixed seeds the
+# foods must be reached in the same order as in the float64 run, and no nucleus may
+# drift further from its float64 position than the bound stated in the README.
+#
+#   python benchmarks/float32_drift.py [steps]
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from slime.mold import MoldSimulation
+
+STEPS = 2000
+SEEDS = range(7)
+BOUND = 1.0  # units
+FOOD = [
+    (210, 431), (255, 592), (399, 596), (657, 476),
+    (641, 117), (287, 173), (492, 206), (478, 428),
+    (398, 264), (509, 606), (357, 395), (428, 464)
+]
+
+
+# step a float64 and a float32 run side by side; returns (food order of each run, largest drift)
+def compare(seed, steps):
+    sims, states = [], []
+    for precision in ("float64", "float32"):
+        sim = MoldSimulation(precision=precision)
+        sim.add_food_sources(FOOD)
+        np.random.seed(seed)
+        sims.append(sim)
+        states.append(np.random.get_state())
+
+    drift = 0.0
+    for _ in range(steps):
+        # each run draws spawn seeds from its own copy of the global generator
+        for k, sim in enumerate(sims):
+            np.random.set_state(states[k])
+            sim.step()
+            states[k] = np.random.get_state()
+        a, b = ([cell.location for cell in sim.cells] for sim in sims)
+        if len(a) != len(b):
+            break  # spawned at different steps, the order check below reports it
+        if a:
+            drift = max(drift, float(np.abs(np.array(a) - np.array(b, dtype=float)).max()))
+    orders = [[food for _, food, _ in sim.food_events] for sim in sims]
+    return orders, drift
+
+
+def main():
+    steps = int(sys.argv[1]) if len(sys.argv) > 1 else STEPS
+    for seed in SEEDS:
+        (order64, order32), drift = compare(seed, steps)
+        print(f"seed {seed}: {len(order64)} food reaches, max drift {drift:.3f} units over {steps} steps")
+        assert order32 == order64, f"seed {seed}: float32 reached the foods in a different order"
+        assert drift <= BOUND, f"seed {seed}: float32 drifted {drift:.3f} units, over the {BOUND} unit bound"
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,44 @@
+import os
+import subprocess
+import sys
+
+# Startup benchmark for headless workers: importing the simulation core must stay
+# fast and must not pull in the plotting or dataframe stacks.
+#
+#   python benchmarks/import_time.py [budget_seconds]
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BUDGET = 0.25  # seconds, including the NumPy import
+RUNS = 5
+HEAVY = ("pandas", "matplotlib", "scipy", "networkx")
+
+PROBE = """
+import sys, time
+t = time.perf_counter()
+import slime.mold
+import slimenw.n_mold
+elapsed = time.perf_counter() - t
+heavy = [m for m in {heavy!r} if m in sys.modules]
+print(elapsed, ",".join(heavy))
+"""
+
+
+# import the core in a fresh interpreter and return (seconds, heavy modules loaded)
+def measure():
+    out = subprocess.run([sys.executable, "-c", PROBE.format(heavy=HEAVY)], cwd=ROOT,
+                         capture_output=True, text=True, check=True).stdout.split()
+    return float(out[0]), [m for m in out[1:2] if m]
+
+
+def main():
+    budget = float(sys.argv[1]) if len(sys.argv) > 1 else BUDGET
+    results = [measure() for _ in range(RUNS)]
+    best = min(t for t, _ in results)
+    heavy = results[0][1]
+    print(f"import slime.mold + slimenw.n_mold: best of {RUNS} = {best * 1000:.1f} ms (budget {budget * 1000:.0f} ms)")
+    assert not heavy, f"core import pulled in {heavy}"
+    assert best < budget, f"core import took {best:.3f}s, over the {budget:.3f}s budget"
+
+
+if __name__ == "__main__":
+    main()
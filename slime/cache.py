@@ -0,0 +1,209 @@
+import hashlib
+import json
+import os
+import tempfile
+
+import numpy as np
+
+# Content-addressed cache of finished runs. A run is identified by a hash of the full
+# simulation configuration (sim.config()), the step count, the seed and the source code
+# of the slime and slimenw packages, so editing the engine invalidates old entries.
+
+CACHE_ENV = "SLIME_CACHE_DIR"
+_PACKAGES = ("slime", "slimenw")
+_code_version = None
+
+
+# hash of every .py file in the simulation packages
+def code_version():
+    global _code_version
+    if _code_version is None:
+        root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        h = hashlib.sha256()
+        for package in _PACKAGES:
+            directory = os.path.join(root, package)
+            if not os.path.isdir(directory):
+                continue
+            for name in sorted(os.listdir(directory)):
+                if name.endswith(".py"):
+                    h.update(f"{package}/{name}".encode())
+                    with open(os.path.join(directory, name), "rb") as f:
+                        h.update(f.read())
+        _code_version = h.hexdigest()
+    return _code_version
+
+
+def config_key(sim, steps, seed):
+    """Stable hash of a run, or None if the run can not be cached."""
+    config = sim.config()
+    if config is None or seed is None:
+        return None  # without a seed the result depends on whatever the global generator holds
+    payload = json.dumps({"config": config, "steps": steps, "seed": seed, "code": code_version()},
+                         sort_keys=True)
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+class ResultCache:
+    """Directory of ``<key>.npz`` results with least-recently-used eviction.
+
+    Entries are evicted, oldest access first, once there are more than
+    ``max_entries`` of them or they take more than ``max_bytes`` together.
+    """
+
+    def __init__(self, directory, max_entries=256, max_bytes=1 << 30):
+        self.directory = directory
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        os.makedirs(directory, exist_ok=True)
+
+    def path(self, key):
+        return os.path.join(self.directory, f"{key}.npz")
+
+    def get(self, key):
+        path = self.path(key)
+        try:
+            with np.load(path) as data:
+                result = {name: data[name] for name in data.files}
+        except (OSError, ValueError):
+            return None
+        os.utime(path)  # mark as recently used
+        return result
+
+    def put(self, key, result):
+        # write to a temporary file first so concurrent workers never read half an entry
+        fd, tmp = tempfile.mkstemp(suffix=".npz", dir=self.directory)
+        with os.fdopen(fd, "wb") as f:
+            np.savez(f, **result)
+        os.replace(tmp, self.path(key))
+        self.evict()
+
+    def evict(self):
+        entries = []
+        for name in os.listdir(self.directory):
+            if name.endswith(".npz"):
+                try:
+                    st = os.stat(os.path.join(self.directory, name))
+                except OSError:
+                    continue
+                entries.append((st.st_mtime, st.st_size, name))
+        entries.sort()
+        total = sum(size for _, size, _ in entries)
+        while entries and (len(entries) > self.max_entries or total > self.max_bytes):
+            _, size, name = entries.pop(0)
+            try:
+                os.remove(os.path.join(self.directory, name))
+            except OSError:
+                pass
+            total -= size
+
+
+# cache configured through the SLIME_CACHE_DIR environment variable, if any
+def default_cache():
+    directory = os.environ.get(CACHE_ENV)
+    return ResultCache(directory) if directory else None
+
+
+def run_cached(sim, steps, seed=None, cache=None):
+    """Run ``steps`` steps of a fresh simulation, reusing a cached result when there is one.
+
+    Returns True on a cache hit, in which case the simulation state is restored
+    from the cache instead of being computed. Runs with an event log or a live
+    state writer attached always step, since both need every step.
+    """
+    fresh = not sim.cells and sim.step_count == 0
+    key = config_key(sim, steps, seed) if cache is not None and fresh else None
+    observed = getattr(sim, "event_log", None) is not None or getattr(sim, "live_state", None) is not None
+    if key is not None and not observed:
+        result = cache.get(key)
+        if result is not None:
+            restore(sim, result)
+            return True
+
+    if seed is not None:
+        np.random.seed(seed)
+    for _ in range(steps):
+        sim.step()
+
+    if key is not None:
+        cache.put(key, snapshot(sim))
+    return False
+
+
+# concatenate variable-length lists into (flat values, offsets)
+def _ragged(lists, dtype):
+    offsets = np.zeros(len(lists) + 1, dtype=np.int64)
+    offsets[1:] = np.cumsum([len(values) for values in lists])
+    flat = np.concatenate([np.asarray(values, dtype=dtype) for values in lists]) if lists else np.zeros(0, dtype)
+    return flat, offsets
+
+
+def _unragged(flat, offsets):
+    return [flat[offsets[k]:offsets[k + 1]] for k in range(len(offsets) - 1)]
+
+
+def snapshot(sim):
+    """Arrays describing the full state of a simulation after a run."""
+    cells = sim.cells
+    none = -1
+    result = {
+        "positions": np.array([cell.location for cell in cells]).reshape(-1, 2),
+        "acceleration": np.array([cell.acceleration for cell in cells]).reshape(-1, 2),
+        "seeds": np.array([cell.seed for cell in cells], dtype=np.int64),
+        "path_length": np.array([cell.path_length for cell in cells], dtype=float),
+        "last_food": np.array([none if cell.last_food_index is None else cell.last_food_index for cell in cells], dtype=np.int64),
+        "closest_oat": np.array([none if cell.closest_oat_index is None else cell.closest_oat_index for cell in cells], dtype=np.int64),
+        "food_events": np.array(sim.food_events, dtype=np.int64).reshape(-1, 3),
+        "remaining": np.array([oat.index for oat in sim.oats], dtype=np.int64),
+        "force_grid": sim.force_grid(),
+        "state": np.array([sim.step_count, sim.trail_count, sim.add_spawn, sim.new_spawn_x, sim.new_spawn_y,
+                           none if sim.spawn_food_index is None else sim.spawn_food_index], dtype=float),
+    }
+    result["trail_x"], result["trail_offsets"] = _ragged([cell.trail_x for cell in cells], float)
+    result["trail_y"], _ = _ragged([cell.trail_y for cell in cells], float)
+    result["permanent_nuclei"], result["permanent_offsets"] = _ragged([oat.nuclei_index for oat in sim.oats_permanent], np.int64)
+    result["remaining_nuclei"], result["remaining_offsets"] = _ragged([oat.nuclei_index for oat in sim.oats], np.int64)
+    result["network_edges"], result["network_weights"], result["network_lengths"] = sim.network.to_arrays()
+    _, keys, pos, has_gauss, cached_gaussian = np.random.get_state()
+    result["rng"] = keys
+    result["rng_state"] = np.array([pos, has_gauss, cached_gaussian], dtype=float)
+    if getattr(sim, "chemo", None) is not None:
+        result["chemo"] = sim.chemo.grid
+    return result
+
+
+def restore(sim, result):
+    """Put a fresh simulation in the state recorded by snapshot()."""
+    positions, acceleration = result["positions"], result["acceleration"]
+    trail_x = _unragged(result["trail_x"], result["trail_offsets"])
+    trail_y = _unragged(result["trail_y"], result["trail_offsets"])
+    sim.cells = []
+    for k in range(len(positions)):
+        cell = sim._new_nucleus(positions[k, 0], positions[k, 1], int(result["seeds"][k]))
+        cell.location[:] = positions[k]
+        cell.acceleration[:] = acceleration[k]
+        cell.path_length = float(result["path_length"][k])
+        cell.last_food_index = int(result["last_food"][k]) if result["last_food"][k] >= 0 else None
+        cell.closest_oat_index = int(result["closest_oat"][k]) if result["closest_oat"][k] >= 0 else None
+        cell.set_trail(trail_x[k], trail_y[k])
+        sim.cells.append(cell)
+
+    for oat, nuclei in zip(sim.oats_permanent, _unragged(result["permanent_nuclei"], result["permanent_offsets"])):
+        oat.nuclei_index = nuclei.tolist()
+    by_index = {oat.index: oat for oat in sim.oats}
+    sim.oats = [by_index[int(index)] for index in result["remaining"]]
+    for oat, nuclei in zip(sim.oats, _unragged(result["remaining_nuclei"], result["remaining_offsets"])):
+        oat.nuclei_index = nuclei.tolist()
+
+    sim.food_events = [tuple(event) for event in result["food_events"].tolist()]
+    sim.network.load(result["network_edges"], result["network_weights"], result["network_lengths"])
+
+    step_count, trail_count, add_spawn, spawn_x, spawn_y, spawn_food = result["state"].tolist()
+    sim.step_count, sim.trail_count, sim.add_spawn = int(step_count), int(trail_count), bool(add_spawn)
+    sim.new_spawn_x, sim.new_spawn_y = spawn_x, spawn_y
+    sim.spawn_food_index = int(spawn_food) if spawn_food >= 0 else None
+    sim._force_grid = result["force_grid"]
+    if getattr(sim, "chemo", None) is not None and "chemo" in result:
+        sim.chemo.grid = result["chemo"].copy()
+
+    pos, has_gauss, cached_gaussian = result["rng_state"].tolist()
+    np.random.set_state(("MT19937", result["rng"], int(pos), int(has_gauss), cached_gaussian))
@@ -0,0 +1,118 @@
+import numpy as np
+from math import ceil
+
+# diffusing and decaying chemoattractant laid down by the nuclei
+class ChemoField:
+    """Chemoattractant concentration on a float32 grid.
+
+    Nuclei deposit into the grid every step (scatter-add), the field is
+    blurred with a Gaussian kernel and decays by a constant fraction.
+    Small kernels use a separable convolution on shifted slices; kernels
+    wider than ``fft_radius`` cells use an FFT convolution instead. Both
+    treat the domain edge as absorbing (zero outside the grid), so the two
+    paths give the same field up to float32 rounding.
+    """
+
+    def __init__(self, width, height, cell_size=1.0, deposit=1.0, decay=0.05, sigma=1.0,
+                 sensitivity=1.0, fft_radius=8):
+        self.cell_size = cell_size
+        self.sigma = sigma
+        self.deposit_amount = np.float32(deposit)
+        self.decay = decay
+        self.sensitivity = sensitivity  # scales the gradient into a steering force
+        self.fft_radius = fft_radius
+        self.grid = np.zeros((int(ceil(height / cell_size)), int(ceil(width / cell_size))), dtype=np.float32)
+
+        # normalized 1D Gaussian, applied along each axis
+        self.radius = max(1, int(ceil(3 * sigma)))
+        x = np.arange(-self.radius, self.radius + 1, dtype=float)
+        kernel = np.exp(-0.5 * (x / sigma) ** 2)
+        self.kernel = (kernel / kernel.sum()).astype(np.float32)
+        self._kernel_fft = None
+        self._buffers = None
+
+    # parameters that determine how the field evolves (used to key cached results)
+    def config(self):
+        return {"cell_size": self.cell_size, "deposit": float(self.deposit_amount), "decay": self.decay,
+                "sigma": self.sigma, "sensitivity": self.sensitivity, "fft_radius": self.fft_radius}
+
+    # grid indices of the given (N, 2) positions and a mask of the ones inside the grid
+    def _cells(self, positions):
+        ix = np.floor(positions[:, 0] / self.cell_size).astype(np.intp)
+        iy = np.floor(positions[:, 1] / self.cell_size).astype(np.intp)
+        rows, cols = self.grid.shape
+        inside = (ix >= 0) & (ix < cols) & (iy >= 0) & (iy < rows)
+        return ix, iy, inside
+
+    def deposit(self, positions):
+        """Add chemoattractant at every (x, y) in ``positions``."""
+        ix, iy, inside = self._cells(np.asarray(positions))
+        flat = iy[inside] * self.grid.shape[1] + ix[inside]
+        np.add.at(self.grid.ravel(), flat, self.deposit_amount)
+
+    def diffuse(self):
+        if self.radius > self.fft_radius:
+            self.grid = self._diffuse_fft()
+        else:
+            self.grid = self._diffuse_separable()
+
+    def _diffuse_separable(self, block_rows=64):
+        r = self.radius
+        rows, cols = self.grid.shape
+        if self._buffers is None or self._buffers[0].shape != (rows + 2 * r, cols + 2 * r):
+            # zero-padded copy of the grid and per-block buffers for the blur along y and for
+            # the weighted taps, allocated once (the padding is never written)
+            self._buffers = (np.zeros((rows + 2 * r, cols + 2 * r), np.float32),
+                             np.zeros((block_rows, cols + 2 * r), np.float32),
+                             np.empty((block_rows, cols), np.float32))
+        padded, blurred, tmp = self._buffers
+        padded[r:r + rows, r:r + cols] = self.grid
+        # blur one block of rows at a time so the intermediate results stay in cache:
+        # along y into the middle of the block buffer, then along x back into the grid
+        for start in range(0, rows, block_rows):
+            n = min(block_rows, rows - start)
+            self._blur(lambda k: padded[start + k:start + k + n, r:r + cols], blurred[:n, r:r + cols], tmp[:n, :cols])
+            self._blur(lambda k: blurred[:n, k:k + cols], self.grid[start:start + n], tmp[:n, :cols])
+        return self.grid
+
+    # out = sum of kernel[k] * window(k); the kernel is symmetric, so the two windows
+    # sharing a weight are added first and multiplied once
+    def _blur(self, window, out, tmp):
+        r = self.radius
+        np.multiply(window(r), self.kernel[r], out=out)
+        for k in range(r):
+            np.add(window(k), window(2 * r - k), out=tmp)
+            tmp *= self.kernel[k]
+            out += tmp
+
+    def _diffuse_fft(self):
+        r = self.radius
+        rows, cols = self.grid.shape
+        shape = (rows + 2 * r, cols + 2 * r)  # zero padding keeps the convolution linear, not circular
+        if self._kernel_fft is None or self._kernel_fft[0] != shape:
+            kernel = np.outer(self.kernel, self.kernel)
+            self._kernel_fft = (shape, np.fft.rfft2(kernel, s=shape))
+        full = np.fft.irfft2(np.fft.rfft2(self.grid, s=shape) * self._kernel_fft[1], s=shape)
+        return full[r:r + rows, r:r + cols].astype(np.float32)
+
+    # one field update: deposit, diffuse and decay
+    def update(self, positions):
+        self.deposit(positions)
+        self.diffuse()
+        self.grid *= np.float32(1 - self.decay)
+
+    def gradient(self, positions):
+        """Central-difference gradient of the field at every (x, y), shape (N, 2)."""
+        ix, iy, _ = self._cells(np.asarray(positions))
+        rows, cols = self.grid.shape
+        ix = np.clip(ix, 1, cols - 2)
+        iy = np.clip(iy, 1, rows - 2)
+        grad = np.empty((len(ix), 2), dtype=np.float32)
+        grad[:, 0] = self.grid[iy, ix + 1] - self.grid[iy, ix - 1]
+        grad[:, 1] = self.grid[iy + 1, ix] - self.grid[iy - 1, ix]
+        grad /= np.float32(2 * self.cell_size)
+        return grad
+
+    def forces(self, positions):
+        # nuclei move against their acceleration, so pushing them up the gradient needs the minus sign
+        return -self.sensitivity * self.gradient(positions)
@@ -0,0 +1,13 @@
+import numpy as np
+import pandas as pd
+
+# CSV export lives here so the simulation core can be imported without pandas
+
+
+# write a 2D grid without index or header, as read by the original PDE sketch
+def write_grid_csv(grid, filename):
+    pd.DataFrame(grid).to_csv(filename, index=False, header=False)
+
+
+def write_trail_csv(trail_x, trail_y, filename):
+    pd.DataFrame({"x": np.asarray(trail_x), "y": np.asarray(trail_y)}).to_csv(filename, index=False)
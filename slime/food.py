@@ -3,8 +3,9 @@ import numpy as np
 # food class
 class Food:
     # function to initialize food location
-    def __init__(self, x, y):
+    def __init__(self, x, y, index=None):
         self.location = np.array([x, y], dtype=float)
+        self.index = index # position of this food in oats_permanent
         self.nuclei_index = [] # list to store indices of nuclei that have consumed this food
 
     # add a nucleus index to the list of connected nuclei
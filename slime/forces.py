@@ -0,0 +1,150 @@
+import numpy as np
+
+from slime import kernels
+
+# Force terms for MoldSimulation. Each term adds its contribution for the whole
+# population to the shared acceleration array in one vectorized call, in the order
+# the terms are listed in sim.force_terms. New field sources only need to implement
+# accumulate() (and grid_forces() to show up in export_force_grid).
+
+
+class ForceTerm:
+    name = "force"
+
+    def accumulate(self, sim, positions, acceleration):
+        """Add this term's force for every nucleus to ``acceleration`` (both (N, 2), in place)."""
+        raise NotImplementedError
+
+    def after_move(self, sim, positions):
+        """Called with the new positions once the nuclei have moved."""
+
+    def grid_forces(self, sim, points):
+        """Force this term would apply at each of the (P, 2) ``points``."""
+        raise NotImplementedError
+
+    # parameters that change the outcome of a run, used to key cached results
+    def config(self):
+        return {"name": self.name}
+
+
+class FoodAttraction(ForceTerm):
+    """Pull towards the closest remaining food, plus the food-reach bookkeeping.
+
+    The magnitude is ``sqrt(sim.force_constant / distance)``. Nuclei within
+    ``reach_distance`` of a food are handed to ``sim._reach_food`` in nucleus
+    order; when that consumes a food, the nuclei after the consumer are
+    recomputed against the remaining foods, exactly as if the population had
+    been stepped one nucleus at a time.
+    """
+
+    name = "attraction"
+
+    def __init__(self, reach_distance=10):
+        self.reach_distance = reach_distance
+
+    def accumulate(self, sim, positions, acceleration):
+        cells = sim.cells
+        n = len(cells)
+        closest = np.full(n, -1)
+        forces = np.zeros_like(positions)
+        has_force = np.zeros(n, dtype=bool)
+
+        start = 0
+        while start < n:
+            if not sim.oats:
+                # the last food was consumed, nothing attracts the remaining nuclei
+                closest[start:] = -1
+                has_force[start:] = False
+                break
+            food = np.array([oat.location for oat in sim.oats], dtype=positions.dtype)
+            rest = positions[start:]
+            chunks = sim._map_chunks(lambda s: sim.kernels.attraction(rest[s], food, sim.force_constant,
+                                                                      self.reach_distance), n - start)
+            closest[start:] = np.concatenate([c[0] for c in chunks])
+            forces[start:] = np.concatenate([c[1] for c in chunks])
+            has_force[start:] = np.concatenate([c[2] for c in chunks])
+            reached = np.concatenate([c[3] for c in chunks])
+
+            next_start = n
+            for k in np.flatnonzero(reached.any(axis=1)):
+                i = start + k
+                consumed = False
+                for j in np.flatnonzero(reached[k]):
+                    if i not in sim.oats[j].nuclei_index and sim._reach_food(i, cells[i], j):
+                        consumed = True
+                        break
+                if consumed:
+                    next_start = i + 1
+                    break
+            start = next_start
+
+        acceleration[has_force] += forces[has_force]
+        # nuclei keep their previous closest food once none is left
+        found = closest >= 0
+        sim.population.closest_oat[found] = closest[found]
+
+    def grid_forces(self, sim, points):
+        food = np.array([oat.location for oat in sim.oats_permanent], dtype=points.dtype).reshape(-1, 2)
+        if len(food) == 0:
+            return np.zeros_like(points)
+        _, forces, _, _ = kernels.attraction(points, food, sim.force_constant, self.reach_distance)
+        return forces
+
+    def config(self):
+        return {"name": self.name, "reach_distance": self.reach_distance}
+
+
+class ObstacleRepulsion(ForceTerm):
+    """Push away from every NonAttractor within its radius, ``sqrt(strength / max(distance, 1))``."""
+
+    name = "repulsion"
+
+    def __init__(self, obstacles):
+        self.obstacles = obstacles  # list of NonAttractor, shared with the simulation
+
+    def _arrays(self, dtype):
+        locations = np.array([na.location for na in self.obstacles], dtype=dtype).reshape(-1, 2)
+        strength = np.array([na.strength for na in self.obstacles], dtype=dtype)
+        radius = np.array([na.radius for na in self.obstacles], dtype=dtype)
+        return locations, strength, radius
+
+    def accumulate(self, sim, positions, acceleration):
+        if not self.obstacles:
+            return
+        locations, strength, radius = self._arrays(positions.dtype)
+        closest = np.concatenate(sim._map_chunks(
+            lambda s: sim.kernels.repulsion(positions[s], acceleration[s], locations, strength, radius),
+            len(positions)))
+        sim.population.closest_non_attractor[:] = closest
+
+    def grid_forces(self, sim, points):
+        forces = np.zeros_like(points)
+        if self.obstacles:
+            kernels.repulsion(points, forces, *self._arrays(points.dtype))
+        return forces
+
+    def config(self):
+        return {"name": self.name,
+                "obstacles": [na.location.tolist() + [na.strength, na.radius] for na in self.obstacles]}
+
+
+class Chemoattraction(ForceTerm):
+    """Steering up the gradient of a ChemoField, which is updated after every move."""
+
+    name = "chemo"
+
+    def __init__(self, field):
+        self.field = field
+
+    def accumulate(self, sim, positions, acceleration):
+        acceleration += self.field.forces(positions)
+
+    def after_move(self, sim, positions):
+        # deposit at the new positions, then diffuse and decay
+        self.field.update(positions)
+
+    def grid_forces(self, sim, points):
+        return self.field.forces(points).astype(points.dtype)
+
+    def config(self):
+        return dict(self.field.config(), name=self.name)
@@ -0,0 +1,256 @@
+import numpy as np
+from scipy.sparse import csr_matrix
+from scipy.sparse.csgraph import dijkstra
+
+from slime.mold import MoldSimulation
+from slime.food import Food
+from slime.graph_nucleus import GraphNucleus
+
+
+class GraphMoldSimulation(MoldSimulation):
+    """Foraging simulation where nuclei walk along the edges of a street network.
+
+    The network is stored as CSR adjacency arrays (``indptr``, ``indices``,
+    ``edge_length``) and food sits on nodes. Shortest-path distances and
+    next-hop edges towards every food are computed once with Dijkstra and
+    cached, so choosing the next edge for a nucleus is a table lookup. The
+    nearest-remaining-food table is rebuilt lazily whenever a food is consumed.
+    """
+
+    # initialize from a networkx graph (see from_graphml for loading files)
+    def __init__(self, graph, num_nuclei=50, num_cells_to_reach_oats=5, speed=0.5, exploration=0.1,
+                 weight="length", directed=False, spawn_node=None):
+        super().__init__(num_nuclei=num_nuclei, num_cells_to_reach_oats=num_cells_to_reach_oats)
+        self.speed = speed              # distance travelled along an edge per step
+        self.exploration = exploration  # probability of taking a random edge instead of the next hop
+        self.weight = weight
+
+        self._build_csr(graph, weight, directed)
+        xmin, ymin = self.node_xy.min(axis=0)
+        xmax, ymax = self.node_xy.max(axis=0)
+        self.bounds = (xmin, ymin, xmax, ymax)
+        self.width = xmax - xmin
+        self.height = ymax - ymin
+
+        # spawn at the requested node or at the node closest to the centre of the network
+        if spawn_node is None:
+            self.spawn_node = self.closest_node((xmin + xmax) / 2, (ymin + ymax) / 2)
+        else:
+            self.spawn_node = self.node_index[spawn_node]
+        self.new_spawn_x, self.new_spawn_y = self.node_xy[self.spawn_node]
+
+        self.food_nodes = []        # graph node (CSR index) of every entry in oats_permanent
+        self._remaining_food = {}   # oats_permanent index -> entry in oats, for the foods not consumed yet
+        self._food_at_node = {}     # graph node -> oats_permanent indices of the foods on it
+        self._food_dist = None      # (num_food, num_nodes) distance from each node to each food
+        self._food_hop = None       # (num_food, num_nodes) CSR edge index of the next hop towards each food
+        self._nearest = None        # (num_nodes,) oats_permanent index of the nearest remaining food
+
+    @classmethod
+    def from_graphml(cls, filename, **kwargs):
+        """Load a street network from a local GraphML file (e.g. one saved by osmnx)."""
+        import networkx as nx
+
+        return cls(nx.read_graphml(filename), **kwargs)
+
+    # graph runs are not cached: their state (edges in progress, per-nucleus generators) is not in snapshot()
+    def config(self):
+        return None
+
+    # convert the networkx graph into CSR arrays, keeping the shortest of any parallel edges
+    def _build_csr(self, graph, weight, directed):
+        self.node_ids = list(graph.nodes)
+        self.node_index = {node: i for i, node in enumerate(self.node_ids)}
+        self.node_xy = np.array([[float(graph.nodes[node]["x"]), float(graph.nodes[node]["y"])]
+                                 for node in self.node_ids], dtype=float)
+        n = len(self.node_ids)
+
+        src, dst, length = [], [], []
+        for u, v, data in graph.edges(data=True):
+            i, j = self.node_index[u], self.node_index[v]
+            if i == j:
+                continue
+            w = data.get(weight)
+            w = float(w) if w is not None else float(np.linalg.norm(self.node_xy[i] - self.node_xy[j]))
+            src.append(i)
+            dst.append(j)
+            length.append(w)
+            # slime mould does not care about one-way streets unless asked to
+            if not (directed and graph.is_directed()):
+                src.append(j)
+                dst.append(i)
+                length.append(w)
+
+        src = np.array(src, dtype=np.int64)
+        dst = np.array(dst, dtype=np.int64)
+        length = np.array(length, dtype=float)
+        order = np.lexsort((length, dst, src))
+        src, dst, length = src[order], dst[order], length[order]
+        keep = np.ones(len(src), dtype=bool)
+        keep[1:] = (src[1:] != src[:-1]) | (dst[1:] != dst[:-1])
+        src, dst, length = src[keep], dst[keep], length[keep]
+
+        self.indptr = np.zeros(n + 1, dtype=np.int64)
+        np.cumsum(np.bincount(src, minlength=n), out=self.indptr[1:])
+        self.indices = dst
+        self.edge_length = length
+        self._edge_key = src * n + dst  # sorted, used to look up the CSR index of (u, v)
+
+    # index of the graph node closest to (x, y)
+    def closest_node(self, x, y):
+        d = (self.node_xy[:, 0] - x) ** 2 + (self.node_xy[:, 1] - y) ** 2
+        return int(np.argmin(d))
+
+    # add food on graph nodes (node ids as they appear in the graph)
+    def add_food_nodes(self, nodes):
+        self._check_food_can_change()
+        for node in nodes:
+            self._add_food_at(self.node_index[node])
+
+    # add food at coordinates, snapped to the closest node
+    def add_food_sources(self, food_coords):
+        self._check_food_can_change()
+        for x, y in food_coords:
+            self._add_food_at(self.closest_node(x, y))
+
+    def _add_food_at(self, node):
+        x, y = self.node_xy[node]
+        index = len(self.oats_permanent)
+        self._food_at_node.setdefault(node, []).append(index)
+        self.food_nodes.append(node)
+        self.oats.append(Food(x, y, index))
+        self.oats_permanent.append(Food(x, y, index))
+        self._remaining_food[index] = self.oats[-1]
+        self.network.add_food(x, y)
+        self._food_dist = self._food_hop = self._nearest = None
+
+    # distance and next-hop tables towards every food, computed once
+    def _food_tables(self):
+        if self._food_dist is None:
+            n = len(self.node_ids)
+            # scipy drops explicit zeros, so keep zero-length edges as tiny weights
+            graph = csr_matrix((np.maximum(self.edge_length, 1e-9), self.indices, self.indptr), shape=(n, n))
+            # searching the reversed graph from a food gives distances *to* that food, and the
+            # predecessor of a node in that tree is its next hop along the shortest path
+            dist, pred = dijkstra(graph.T.tocsr(), directed=True, indices=self.food_nodes,
+                                  return_predecessors=True)
+            hop = np.full(pred.shape, -1, dtype=np.int64)
+            reachable = pred >= 0
+            nodes = np.nonzero(reachable)[1]
+            hop[reachable] = np.searchsorted(self._edge_key, nodes * n + pred[reachable])
+            self._food_dist = np.atleast_2d(dist)
+            self._food_hop = hop
+        return self._food_dist, self._food_hop
+
+    # oats_permanent index of the nearest remaining food for every node (-1 if none is reachable)
+    def _nearest_food(self):
+        if self._nearest is None:
+            dist, _ = self._food_tables()
+            nearest = np.full(len(self.node_ids), -1, dtype=np.int64)
+            if self._remaining_food:
+                remaining = np.array(list(self._remaining_food))
+                sub = dist[remaining]
+                best = np.argmin(sub, axis=0)
+                reachable = np.isfinite(sub[best, np.arange(sub.shape[1])])
+                nearest[reachable] = remaining[best[reachable]]
+            self._nearest = nearest
+        return self._nearest
+
+    # pick the next edge for a nucleus sitting on a node
+    def _choose_edge(self, cell):
+        food = self._nearest_food()[cell.node]
+        cell.set_closest_oat(food if food >= 0 else None)  # oats_permanent index
+        edge = self._food_tables()[1][food, cell.node] if food >= 0 else -1
+        if edge < 0 or cell.rng.uniform() < self.exploration:
+            start, end = self.indptr[cell.node], self.indptr[cell.node + 1]
+            edge = start + cell.rng.randint(end - start) if end > start else -1
+        if edge >= 0:
+            cell.start_edge(edge)
+
+    # bookkeeping when a nucleus arrives at a node; several foods can snap to the same
+    # node, and like MoldSimulation the nucleus stops after one of them gets consumed
+    def _check_food(self, i, cell):
+        for food in self._food_at_node.get(cell.node, ()):
+            oat = self._remaining_food.get(food)
+            if oat is not None and i not in oat.nuclei_index and self._reach_node_food(i, cell, oat):
+                break
+
+    # bookkeeping when nucleus i reaches a food; returns True if the food got consumed
+    def _reach_node_food(self, i, cell, oat):
+        food = oat.index
+        oat.add_nucleus(i)
+        self.oats_permanent[food].add_nucleus(i)
+        self._record_connection(cell, food)
+        self.food_events.append((self.step_count, food, i))
+        if self.event_log is not None:
+            self.event_log.reach(self.step_count, food, i)
+        cell.trail_x.append(oat.location[0])
+        cell.trail_y.append(oat.location[1])
+
+        if len(oat.nuclei_index) > self.num_cells_to_reach_oats:
+            self.add_spawn = True
+            self.spawn_node = cell.node
+            self.new_spawn_x, self.new_spawn_y = oat.location
+            self.spawn_food_index = food
+            self.oats.remove(oat)
+            del self._remaining_food[food]
+            self._nearest = None
+            if self.event_log is not None:
+                self.event_log.consumed(self.step_count, food)
+            return True
+        return False
+
+    # run one simulation step
+    def step(self):
+        # Record trail only every 20 frames (matching MoldSimulation)
+        self.step_count += 1
+        self.trail_count += 1
+        record_trail_this_frame = False
+        if self.trail_count >= 20:
+            record_trail_this_frame = True
+            self.trail_count = 0
+
+        # spawn nuclei on the spawn node
+        if self.add_spawn:
+            for _ in range(self.num_nuclei):
+                cell = GraphNucleus(self.spawn_node, self.node_xy[self.spawn_node], int(np.random.randint(0, 10000)))
+                cell.last_food_index = self.spawn_food_index
+                self.cells.append(cell)
+            self.add_spawn = False
+            if self.event_log is not None:
+                self.event_log.spawn(self.step_count, self.new_spawn_x, self.new_spawn_y, self.num_nuclei)
+
+        # move nuclei along their edges
+        for i, cell in enumerate(self.cells):
+            if cell.edge < 0:
+                self._choose_edge(cell)
+                if cell.edge < 0:
+                    continue  # isolated node
+
+            target = self.indices[cell.edge]
+            length = self.edge_length[cell.edge]
+            cell.path_length += min(self.speed, length - cell.edge_progress)
+            cell.edge_progress += self.speed
+            if cell.edge_progress >= length:
+                # arrived at the end of the edge
+                cell.node = int(target)
+                cell.edge = -1
+                cell.location[:] = self.node_xy[target]
+                self._check_food(i, cell)
+            else:
+                start = self.node_xy[cell.node]
+                cell.location[:] = start + (self.node_xy[target] - start) * (cell.edge_progress / length)
+
+        # record trail only every 20 frames
+        if record_trail_this_frame:
+            for cell in self.cells:
+                cell.record_trail()
+
+        if self.event_log is not None:
+            self.event_log.record(self.step_count, [cell.location for cell in self.cells])
+        if self.live_state is not None:
+            self._publish_live_state()
+
+    def plot(self):
+        from slime.plotting import plot_simulation
+        plot_simulation(self, bounds=self.bounds)
@@ -0,0 +1,37 @@
+import numpy as np
+
+# nucleus that is constrained to the edges of a street network
+class GraphNucleus:
+    def __init__(self, node, location, seed):
+        # initialize at a graph node with position and seed
+        self.node = node               # last node visited
+        self.edge = -1                 # CSR index of the edge being traversed (-1 when sitting on a node)
+        self.edge_progress = 0.0       # distance travelled along the current edge
+        self.location = np.array(location, dtype=float)
+        self.seed = seed
+        self.rng = np.random.RandomState(seed)
+
+        # initialize trail tracking (same layout as Nucleus so plotting keeps working)
+        self.trail_x = [self.location[0]]
+        self.trail_y = [self.location[1]]
+
+        # initialize closest oat tracking
+        self.closest_oat_index = None
+
+        # initialize food network tracking
+        self.last_food_index = None # oats_permanent index of the last food reached
+        self.path_length = 0.0      # distance walked since then
+
+    def set_closest_oat(self, idx):
+        self.closest_oat_index = idx
+
+    # start walking along the edge with the given CSR index
+    def start_edge(self, edge):
+        self.edge = edge
+        self.edge_progress = 0.0
+
+    # record the trail
+    def record_trail(self):
+        # record the current location in the trail arrays
+        self.trail_x.append(self.location[0])
+        self.trail_y.append(self.location[1])
@@ -0,0 +1,77 @@
+import sys
+import warnings
+
+import numpy as np
+
+# Array versions of the per-nucleus force and move rules in MoldSimulation.step.
+# Every result row only depends on the matching input row, so the population can
+# be split into chunks (and processed on several threads) without changing results.
+
+
+# length of every 2-vector along the last axis, computed as a dot product so it
+# rounds exactly like np.linalg.norm on a single vector
+def norm(vectors):
+    return np.sqrt(np.matmul(vectors[..., None, :], vectors[..., :, None])[..., 0, 0])
+
+
+def attraction(positions, food, force_constant, reach_distance=10):
+    """Force towards the closest food for every nucleus.
+
+    Returns ``(closest, forces, has_force, reached)``: index of the closest
+    food, the force vector, whether a force applies (non-zero distance) and an
+    (N, F) mask of the foods within ``reach_distance``.
+    """
+    diff = positions[:, None, :] - food[None, :, :]
+    dist = norm(diff)
+    closest = np.argmin(dist, axis=1)
+
+    rows = np.arange(len(positions))
+    vec = diff[rows, closest]
+    d = dist[rows, closest]
+    has_force = d > 0
+    forces = np.zeros_like(vec)
+    mag = np.sqrt(force_constant / d[has_force])
+    forces[has_force] = vec[has_force] / d[has_force][:, None] * mag[:, None]
+    return closest, forces, has_force, dist < reach_distance
+
+
+def repulsion(positions, acceleration, obstacles, strength, radius):
+    """Add the push away from every obstacle within its radius to ``acceleration``.
+
+    Obstacles are applied one after the other, in order, like the per-nucleus loop.
+    Returns the index of the closest obstacle for every nucleus.
+    """
+    diff = positions[:, None, :] - obstacles[None, :, :]
+    dist = norm(diff)
+    for k in range(len(obstacles)):
+        inside = (dist[:, k] < radius[k]) & (dist[:, k] > 0)
+        d = dist[inside, k]
+        # stronger repulsion closer to the obstacle, capped below a distance of 1
+        mag = np.sqrt(strength[k] / np.maximum(d, 1))
+        acceleration[inside] += diff[inside, k] / d[:, None] * mag[:, None]
+    return np.argmin(dist, axis=1)
+
+
+def move(positions, acceleration, noise, speed=0.5):
+    """Move nuclei in place and reset their acceleration; returns the distance moved."""
+    velocity = noise + acceleration
+    n = norm(velocity)
+    moving = n > 0
+    velocity[moving] = velocity[moving] / n[moving][:, None] * speed
+    # subtract from location (move in opposite direction as in original)
+    positions -= velocity
+    acceleration *= 0
+    return norm(velocity)
+
+
+def backend(name):
+    """Kernel module for ``name`` ("numpy" or "numba"); "numba" falls back to NumPy when it is not installed."""
+    if name == "numba":
+        from slime import kernels_numba
+        if kernels_numba.AVAILABLE:
+            return kernels_numba
+        warnings.warn("numba is not installed, using the NumPy kernels instead", RuntimeWarning, stacklevel=3)
+        name = "numpy"
+    if name == "numpy":
+        return sys.modules[__name__]
+    raise ValueError(f"unknown kernel backend {name!r}, expected 'numpy' or 'numba'")
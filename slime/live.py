@@ -0,0 +1,194 @@
+import os
+import tempfile
+import time
+import uuid
+import weakref
+
+import numpy as np
+
+# Live state of a running simulation in a memory-mapped file, so that monitors and
+# renderers in other processes can follow a run without slowing it down.
+#
+# Layout: an int64 header, then float64 nucleus positions (capacity, 2), float64 food
+# locations (num_food, 2) and a uint8 remaining-food mask (num_food,). The writer is
+# the only process that modifies the file. It makes the header's sequence number odd
+# before updating and even again afterwards (a seqlock), so a reader knows a frame is
+# consistent if it saw the same even sequence number before and after reading it.
+
+MAGIC = 0x534C494D454C4956  # "SLIMELIV"
+LAYOUT_VERSION = 1
+HEADER_SIZE = 16
+# header fields
+_MAGIC, _VERSION, _SEQ, _STEP, _COUNT, _TOTAL, _CAPACITY, _NUM_FOOD, _WIDTH, _HEIGHT = range(10)
+
+
+# a new file name for every call, so several simulations can publish side by side
+def default_path():
+    # /dev/shm keeps the file in memory on Linux
+    directory = "/dev/shm" if os.path.isdir("/dev/shm") else tempfile.gettempdir()
+    return os.path.join(directory, f"slime-live-{os.getpid()}-{uuid.uuid4().hex[:12]}")
+
+
+# remove a writer's file, also run for writers that were never closed (see LiveStateWriter)
+def _remove(path):
+    try:
+        os.remove(path)
+    except OSError:
+        pass
+
+
+def _layout(capacity, num_food):
+    positions = HEADER_SIZE * 8
+    food = positions + capacity * 2 * 8
+    mask = food + num_food * 2 * 8
+    return positions, food, mask, mask + num_food
+
+
+class LiveStateWriter:
+    """Publishes the state of a simulation after every step.
+
+    ``capacity`` is the number of nuclei the file has room for. A MoldSimulation
+    never has more than ``num_nuclei * (number of foods + 1)``; if a run
+    outgrows the capacity anyway, only the first ``capacity`` nuclei are
+    published and the header's total count says how many there are.
+
+    The file is removed by ``close()``, or else when the writer is garbage
+    collected or the interpreter exits (including on an unhandled exception).
+    Only a process killed outright leaves it behind.
+    """
+
+    def __init__(self, path, capacity, food, width, height):
+        self.path = path
+        food = np.asarray(food, dtype=float).reshape(-1, 2)
+        positions, food_offset, mask, size = _layout(capacity, len(food))
+        # create the file exclusively: truncating a file another writer has mapped would
+        # make its next publish() write past the end of the file
+        try:
+            fd = os.open(path, os.O_RDWR | os.O_CREAT | os.O_EXCL, 0o644)
+        except FileExistsError:
+            raise FileExistsError(f"{path} already exists, is another simulation publishing to it?") from None
+        self._finalizer = weakref.finalize(self, _remove, path)
+        with os.fdopen(fd, "r+b") as f:
+            f.truncate(size)
+            self._map = np.memmap(f, dtype=np.uint8, mode="r+", shape=(size,))
+        self.header = self._map[:positions].view(np.int64)
+        self.positions = self._map[positions:food_offset].view(np.float64).reshape(capacity, 2)
+        self.food = self._map[food_offset:mask].view(np.float64).reshape(-1, 2)
+        self.food_mask = self._map[mask:size]
+
+        self.food[:] = food
+        self.food_mask[:] = 1
+        self.header[_SEQ] = 0
+        self.header[_CAPACITY] = capacity
+        self.header[_NUM_FOOD] = len(food)
+        self.header[_WIDTH] = width
+        self.header[_HEIGHT] = height
+        self.header[_VERSION] = LAYOUT_VERSION
+        # readers only attach once the magic number is there
+        self.header[_MAGIC] = MAGIC
+
+    def publish(self, step, positions, remaining):
+        """Write one frame: nucleus positions (N, 2) and the indices of the remaining foods."""
+        remaining = np.asarray(remaining, dtype=np.intp)
+        if len(remaining) and remaining.max() >= len(self.food_mask):
+            raise ValueError(f"food {remaining.max()} is not in {self.path}, which was created with "
+                             f"{len(self.food_mask)} foods; foods cannot be added after sharing starts")
+        count = min(len(positions), len(self.positions))
+        header = self.header
+        header[_SEQ] += 1  # odd: update in progress
+        if count:
+            self.positions[:count] = np.asarray(positions[:count])
+        self.food_mask[:] = 0
+        self.food_mask[remaining] = 1
+        header[_STEP] = step
+        header[_COUNT] = count
+        header[_TOTAL] = len(positions)
+        header[_SEQ] += 1
+
+    def close(self, unlink=True):
+        if self._map is None:
+            return
+        self._map.flush()
+        del self.header, self.positions, self.food, self.food_mask
+        self._map = None
+        if unlink:
+            self._finalizer()
+        else:
+            self._finalizer.detach()
+
+
+class LiveFrame:
+    def __init__(self, sequence, step, count, total, positions, remaining):
+        self.sequence = sequence
+        self.step = step
+        self.count = count          # nuclei in positions
+        self.total = total          # nuclei in the simulation, more than count if it outgrew the file
+        self.positions = positions  # (count, 2)
+        self.remaining = remaining  # bool mask over LiveStateReader.food
+
+
+class LiveStateReader:
+    """Read-only view of a file written by LiveStateWriter, usually in another process.
+
+    ``read()`` returns a consistent copy of the latest frame. For zero-copy
+    access, read ``positions`` and ``food_mask`` directly between ``begin()``
+    and ``retry()``::
+
+        while True:
+            seq = reader.begin()
+            draw(reader.positions[:reader.count], reader.food_mask)
+            if not reader.retry(seq):
+                break
+    """
+
+    def __init__(self, path):
+        self.path = path
+        header = np.memmap(path, dtype=np.int64, mode="r", shape=(HEADER_SIZE,))
+        if header[_MAGIC] != MAGIC or header[_VERSION] != LAYOUT_VERSION:
+            raise ValueError(f"{path} is not a live state file of this version")
+        capacity, num_food = int(header[_CAPACITY]), int(header[_NUM_FOOD])
+        positions, food, mask, size = _layout(capacity, num_food)
+        self._map = np.memmap(path, dtype=np.uint8, mode="r", shape=(size,))
+        self.header = self._map[:positions].view(np.int64)
+        self.positions = self._map[positions:food].view(np.float64).reshape(capacity, 2)
+        self.food = np.array(self._map[food:mask].view(np.float64).reshape(-1, 2))
+        self.food_mask = self._map[mask:size].view(bool)
+        self.width, self.height = int(header[_WIDTH]), int(header[_HEIGHT])
+        self.capacity = capacity
+
+    @property
+    def step(self):
+        return int(self.header[_STEP])
+
+    @property
+    def count(self):
+        return int(self.header[_COUNT])
+
+    def begin(self, timeout=1.0):
+        """Wait until no update is in progress and return the sequence number."""
+        deadline = time.monotonic() + timeout
+        while True:
+            seq = int(self.header[_SEQ])
+            if not seq & 1:
+                return seq
+            if time.monotonic() > deadline:
+                raise TimeoutError(f"{self.path} has been mid-update for {timeout} s, is the writer alive?")
+            time.sleep(0)
+
+    # True if the writer published a new frame since begin() returned seq
+    def retry(self, seq):
+        return int(self.header[_SEQ]) != seq
+
+    def read(self, timeout=1.0):
+        """Consistent copy of the latest frame as a LiveFrame."""
+        while True:
+            seq = self.begin(timeout)
+            step, count, total = (int(v) for v in self.header[_STEP:_TOTAL + 1])
+            positions = np.array(self.positions[:count])
+            remaining = np.array(self.food_mask)
+            if not self.retry(seq):
+                return LiveFrame(seq, step, count, total, positions, remaining)
+
+    def close(self):
+        del self.header, self.positions, self.food_mask
+        self._map = None
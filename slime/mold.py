@@ -1,40 +1,146 @@
 import numpy as np
-import pandas as pd
-import matplotlib.pyplot as plt
-from math import sqrt  
 
 from slime.nucleus import Nucleus
+from slime.population import Population
 from slime.food import Food
-from slime.grid import Grid
+from slime.network import FoodNetwork
+from slime.chemo import ChemoField
+from slime.forces import FoodAttraction, Chemoattraction
+from slime import kernels
 
 
 class MoldSimulation:
     # initialize
-    def __init__(self, width=800, height=800, num_nuclei=50, num_cells_to_reach_oats=5, force_constant=10):
+    def __init__(self, width=800, height=800, num_nuclei=50, num_cells_to_reach_oats=5, force_constant=10, num_threads=None, precision="float64",
+                 kernel_backend="numpy"):
         self.width = width
         self.height = height
         self.num_nuclei = num_nuclei
         self.num_cells_to_reach_oats = num_cells_to_reach_oats
         self.force_constant = force_constant
+        self.num_threads = num_threads # None steps all nuclei on the calling thread, otherwise chunked over this many threads
+        self._executor = None
+        # "numba" runs the force and move kernels compiled, falling back to NumPy if numba is missing
+        self.kernels = kernels.backend(kernel_backend)
+        self.kernel_backend = "numba" if self.kernels is not kernels else "numpy"
+        # float32 halves the population arrays, trail frames and force grid (not the Nucleus views)
+        self.dtype = np.dtype(precision)
+        if self.dtype not in (np.float32, np.float64):
+            raise ValueError(f"precision must be 'float32' or 'float64', not {precision!r}")
 
-        self.cells = []
+        self.cells = [] # Nucleus views of the rows of self.population
+        self.population = Population(self.dtype)
         self.oats = []
         self.oats_permanent = []
         self.new_spawn_x = width / 2
         self.new_spawn_y = height / 2
+        self.spawn_food_index = None # oats_permanent index of the food new nuclei spawn from
         self.add_spawn = True
         self.trail_count = 0
         self.bool_once = True
+        self.network = FoodNetwork()
+        self.chemo = None # optional chemoattractant field, see enable_chemoattractant
+        self.force_terms = [FoodAttraction()] # applied in this order every step, see slime.forces
+        self.step_count = 0
+        self.food_events = [] # (step, oats_permanent index, nucleus index) every time a nucleus reaches a food
+        self.cache = None # ResultCache consulted by run(), defaults to $SLIME_CACHE_DIR
+        self.event_log = None # optional EventLog, see record_events
+        self.live_state = None # optional LiveStateWriter, see share_live_state
+        self._force_grid = None
 
     # add food in the grid
     def add_food_sources(self, food_coords):
+        self._check_food_can_change()
         for x, y in food_coords:
-            self.oats.append(Food(x, y))
-            self.oats_permanent.append(Food(x, y))
-    
+            index = len(self.oats_permanent)
+            self.oats.append(Food(x, y, index))
+            self.oats_permanent.append(Food(x, y, index))
+            self.network.add_food(x, y)
+        self._force_grid = None
+
+    # everything that determines the outcome of a run, used to key cached results
+    def config(self):
+        return {
+            "class": f"{type(self).__module__}.{type(self).__qualname__}",
+            "width": self.width,
+            "height": self.height,
+            "num_nuclei": self.num_nuclei,
+            "num_cells_to_reach_oats": self.num_cells_to_reach_oats,
+            "force_constant": self.force_constant,
+            "precision": self.dtype.name,
+            "kernel_backend": self.kernel_backend,
+            "food": [oat.location.tolist() for oat in self.oats_permanent],
+            "forces": [term.config() for term in self.force_terms],
+        }
+
+    # record positions and food events of every following step for replay (see slime.replay)
+    def record_events(self, keyframe_interval=1000, scale=1024):
+        from slime.replay import EventLog
+        self.event_log = EventLog(keyframe_interval, scale)
+        self.event_log.set_meta(self.width, self.height, [oat.location for oat in self.oats_permanent])
+        return self.event_log
+
+    # publish the state after every following step to a memory-mapped file (see slime.live)
+    def share_live_state(self, path=None, capacity=None):
+        from slime.live import LiveStateWriter, default_path
+        if capacity is None:
+            # one spawn at the start and one per consumed food
+            capacity = self.num_nuclei * (len(self.oats_permanent) + 1)
+        self.live_state = LiveStateWriter(path or default_path(), capacity,
+                                          [oat.location for oat in self.oats_permanent], self.width, self.height)
+        self._publish_live_state()
+        return self.live_state
+
+    # the live state file has room for the foods that existed when sharing started
+    def _check_food_can_change(self):
+        if self.live_state is not None:
+            raise RuntimeError("cannot add food after share_live_state(), add all foods first")
+
+    def _publish_live_state(self, positions=None):
+        if positions is None:
+            positions = [cell.location for cell in self.cells]
+        self.live_state.publish(self.step_count, positions, [oat.index for oat in self.oats])
+
+    # remove the live state file and stop the worker threads; the simulation stays readable
+    def close(self):
+        if self.live_state is not None:
+            self.live_state.close()
+            self.live_state = None
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def run(self, steps, seed=None):
+        """Seed the global generator and run ``steps`` steps, consulting the result cache.
+
+        On a cache hit the state of the finished run (trails, positions, food
+        connections, network and force grid) is restored instead of recomputed.
+        Returns True on a hit.
+        """
+        from slime.cache import default_cache, run_cached
+        return run_cached(self, steps, seed, self.cache or default_cache())
+
+    # add a chemoattractant layer that nuclei deposit into and follow (see ChemoField for options)
+    def enable_chemoattractant(self, **kwargs):
+        self.chemo = ChemoField(self.width, self.height, **kwargs)
+        self.add_force_term(Chemoattraction(self.chemo))
+        return self.chemo
+
+    # add a force term (see slime.forces) after the existing ones
+    def add_force_term(self, term):
+        self.force_terms.append(term)
+        return term
+
     # run one simulation step
     def step(self):
         # Record trail only every 20 frames (matching original)
+        self.step_count += 1
         self.trail_count += 1
         record_trail_this_frame = False
         if self.trail_count >= 20:
@@ -44,105 +150,146 @@ class MoldSimulation:
         # spawn nuclei once
         if self.add_spawn:
             for _ in range(self.num_nuclei):
-                self.cells.append(Nucleus(self.new_spawn_x, self.new_spawn_y, int(np.random.randint(0, 10000))))
+                cell = self._new_nucleus(self.new_spawn_x, self.new_spawn_y, int(np.random.randint(0, 10000)))
+                cell.last_food_index = self.spawn_food_index
+                self.cells.append(cell)
             self.add_spawn = False
+            if self.event_log is not None:
+                self.event_log.spawn(self.step_count, self.new_spawn_x, self.new_spawn_y, self.num_nuclei)
 
-        # update nuclei
-        for i, cell in enumerate(self.cells):
-            if self.oats:
-                distances = [np.linalg.norm(cell.location - oat.location) for oat in self.oats]
-                closest_idx = int(np.argmin(distances))
-                cell.set_closest_oat(closest_idx)
-
-                # force towards closest food
-                temp_vector = cell.location - self.oats[closest_idx].location
-                norm = np.linalg.norm(temp_vector)
-                if norm > 0:
-                    mag = sqrt(self.force_constant / norm)
-                    temp_vector = temp_vector / norm * mag
-                    cell.apply_force(temp_vector)
-
-                # check if nucleus reached food
-                for j, oat in enumerate(self.oats):
-                    if np.linalg.norm(cell.location - oat.location) < 10 and i not in oat.nuclei_index:
-                        oat.add_nucleus(i)
-                        self.oats_permanent[j].add_nucleus(i)
-                        cell.trail_x.append(oat.location[0])
-                        cell.trail_y.append(oat.location[1])
-
-                        if len(oat.nuclei_index) > self.num_cells_to_reach_oats:
-                            self.add_spawn = True
-                            self.new_spawn_x, self.new_spawn_y = oat.location
-                            self.oats.pop(j)
-                            break
-
-        # move nuclei
-        for cell in self.cells:
-            cell.move()
+        positions = self._step_cells()
             
         # record trail only every 20 frames
         if record_trail_this_frame:
-            for cell in self.cells:
-                cell.record_trail()
+            self.population.record_trails()
+
+        if self.event_log is not None:
+            self.event_log.record(self.step_count, positions)
+        if self.live_state is not None:
+            self._publish_live_state(positions)
 
-    def export_force_grid(self, filename="new.csv"):
+    def _new_nucleus(self, x, y, seed):
+        return Nucleus(x, y, seed, self.dtype, self.population)
+
+    # Every force term adds its contribution for the whole population to the acceleration
+    # array, then the move kernel updates the position arrays in place, in chunks on a thread
+    # pool (NumPy releases the GIL inside the kernels). No Nucleus objects are touched.
+    # Results do not depend on the number of threads and match stepping the nuclei one by one.
+    def _step_cells(self):
+        population = self.population
+        positions = population.positions
+        n = len(population)
+        if n == 0:
+            return positions
+        acceleration = population.acceleration
+        noise = population.noise
+
+        for term in self.force_terms:
+            term.accumulate(self, positions, acceleration)
+
+        # move nuclei
+        moved = self._map_chunks(lambda s: self.kernels.move(positions[s], acceleration[s], noise[s]), n)
+        population.path_length[:] += np.concatenate(moved)
+        population.noise_position[:] += 0.01
+        # Nucleus.move reseeds the global generator; leave it in the same state so that
+        # spawn seeds drawn later match stepping the nuclei one by one
+        np.random.seed(int(population.seeds[-1]) + 1)
+        np.random.uniform(0, 1)
+
+        for term in self.force_terms:
+            term.after_move(self, positions)
+        return positions
+
+    # apply fn to consecutive slices covering range(n), one slice per thread
+    def _map_chunks(self, fn, n):
+        bounds = np.linspace(0, n, min(self.num_threads or 1, n) + 1).astype(int)
+        slices = [slice(a, b) for a, b in zip(bounds[:-1], bounds[1:])]
+        if len(slices) == 1:
+            return [fn(slices[0])]
+        if self._executor is None:
+            from concurrent.futures import ThreadPoolExecutor
+            self._executor = ThreadPoolExecutor(max_workers=self.num_threads)
+        return list(self._executor.map(fn, slices))
+
+    # bookkeeping when nucleus i reaches self.oats[j]; returns True if the food got consumed
+    def _reach_food(self, i, cell, j):
+        oat = self.oats[j]
+        oat.add_nucleus(i)
+        self.oats_permanent[oat.index].add_nucleus(i)
+        self._record_connection(cell, oat.index)
+        self.food_events.append((self.step_count, oat.index, i))
+        if self.event_log is not None:
+            self.event_log.reach(self.step_count, oat.index, i)
+        cell.add_trail_point(oat.location[0], oat.location[1])
+
+        if len(oat.nuclei_index) > self.num_cells_to_reach_oats:
+            self.add_spawn = True
+            self.new_spawn_x, self.new_spawn_y = oat.location
+            self.spawn_food_index = oat.index
+            self.oats.pop(j)
+            if self.event_log is not None:
+                self.event_log.consumed(self.step_count, oat.index)
+            return True
+        return False
+
+    # update the food network when a nucleus reaches a food
+    def _record_connection(self, cell, food_index):
+        if cell.last_food_index is not None:
+            self.network.record(cell.last_food_index, food_index, cell.path_length)
+        cell.last_food_index = food_index
+        cell.path_length = 0.0
+
+    def export_force_grid(self, filename="new.csv", terms=None):
         """Export force grid to CSV file, matching the original PDE logic"""
-        grid_points = []
-        grid_objects = []
-        magnitudes = []
-        
-        # create grid objects and find closest oat for each
-        for x in range(0, self.width, 10):
-            for y in range(0, self.height, 10):
-                # find closest oat to this grid point
-                closest_idx, min_dist = None, float('inf')
-                for i, oat in enumerate(self.oats_permanent):
-                    # Use Euclidean distance
-                    d = np.sqrt((x - oat.location[0])**2 + (y - oat.location[1])**2)
-                    if d < min_dist:
-                        closest_idx, min_dist = i, d
-                
-                # create grid object
-                g = Grid(x, y, closest_idx)
-                grid_objects.append(g)
-                
-                # calculate force vector
-                vec = g.location - self.oats_permanent[g.closest_oat_index].location
-                norm = np.linalg.norm(vec)
-                if norm > 0:
-                    mag = sqrt(self.force_constant / norm)
-                else:
-                    mag = 0  
-                
-                grid_points.append((x, y))
-                magnitudes.append(mag)
-
-        # Format 
+        from slime.export import write_grid_csv
+        write_grid_csv(self.force_grid(terms), filename)
+
+    def force_grid(self, terms=None):
+        """Force magnitude on a 10 unit grid, shape (height // 10, width // 10).
+
+        ``terms`` selects the force terms to sum, by name ("attraction",
+        "repulsion", "chemo") or as ForceTerm objects. By default only the
+        attraction to the closest food is included, as in the original PDE.
+        """
+        if terms is None and self._force_grid is not None:
+            return self._force_grid
         rows = self.height // 10
         cols = self.width // 10
-        
-        # Reshape the magnitudes list into a 2D grid
-        grid_data = np.zeros((rows, cols))
-        idx = 0
-        for x in range(cols):
-            for y in range(rows):
-                if idx < len(magnitudes):
-                    grid_data[y, x] = magnitudes[idx]
-                    idx += 1
-        
-        # convert to df
-        df = pd.DataFrame(grid_data)
-        df.to_csv(filename, index=False, header=False)
+        y, x = np.mgrid[0:rows, 0:cols] * 10
+        points = np.stack([x.ravel(), y.ravel()], axis=1).astype(float)
+
+        if terms is None:
+            # attraction magnitude sqrt(force_constant / distance) to the closest food
+            food = np.array([oat.location for oat in self.oats_permanent], dtype=float).reshape(-1, 2)
+            distance = kernels.norm(points[:, None, :] - food[None, :, :]).min(axis=1)
+            magnitudes = np.zeros(len(points))
+            magnitudes[distance > 0] = np.sqrt(self.force_constant / distance[distance > 0])
+        else:
+            forces = np.zeros_like(points)
+            for term in self._select_terms(terms):
+                forces += term.grid_forces(self, points)
+            magnitudes = kernels.norm(forces)
+
+        grid_data = magnitudes.reshape(rows, cols).astype(self.dtype)
+        if terms is None:
+            self._force_grid = grid_data
+        return grid_data
+
+    # force terms by name or object, in the order given
+    def _select_terms(self, terms):
+        if isinstance(terms, str):
+            terms = [terms]
+        selected = []
+        for term in terms:
+            if isinstance(term, str):
+                matches = [t for t in self.force_terms if t.name == term]
+                if not matches:
+                    raise ValueError(f"no force term named {term!r}, have {[t.name for t in self.force_terms]}")
+                selected.extend(matches)
+            else:
+                selected.append(term)
+        return selected
 
     def plot(self):
-        plt.figure(figsize=(8, 8))
-        # draw trails
-        for cell in self.cells:
-            plt.plot(cell.trail_x, cell.trail_y, alpha=0.5)
-        # draw food
-        for oat in self.oats_permanent:
-            plt.scatter(oat.location[0], oat.location[1], c="black", s=30)
-        plt.xlim(0, self.width)
-        plt.ylim(0, self.height)
-        plt.gca().invert_yaxis()
-        plt.show()
+        from slime.plotting import plot_simulation
+        plot_simulation(self)
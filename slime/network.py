@@ -0,0 +1,132 @@
+import numpy as np
+
+# weighted graph of the connections the mould builds between food sources
+class FoodNetwork:
+    """Edge table updated while the simulation runs.
+
+    Every time a nucleus reaches a food after having visited another one, the
+    edge between the two foods gets one more traversal and its length is set
+    to the path length the nucleus walked. Food indices refer to
+    ``oats_permanent``.
+    """
+
+    def __init__(self):
+        self.food_locations = []
+        self.edge_index = {}   # (i, j) with i < j -> row in the edge table
+        self.edges = []
+        self.weights = []      # traversal count
+        self.lengths = []      # latest path length
+
+    # register a food so metrics know where it is
+    def add_food(self, x, y):
+        self.food_locations.append((x, y))
+
+    # record one traversal between two foods
+    def record(self, a, b, length):
+        if a == b:
+            return
+        key = (a, b) if a < b else (b, a)
+        k = self.edge_index.get(key)
+        if k is None:
+            k = len(self.edges)
+            self.edge_index[key] = k
+            self.edges.append(key)
+            self.weights.append(0)
+            self.lengths.append(0.0)
+        self.weights[k] += 1
+        self.lengths[k] = float(length)
+
+    # replace the edge table with arrays as returned by to_arrays()
+    def load(self, edges, weights, lengths):
+        self.edges = [tuple(edge) for edge in np.asarray(edges).tolist()]
+        self.edge_index = {edge: k for k, edge in enumerate(self.edges)}
+        self.weights = np.asarray(weights).tolist()
+        self.lengths = np.asarray(lengths, dtype=float).tolist()
+
+    def to_arrays(self, min_weight=1):
+        """Return ``(edges, weights, lengths)`` as arrays of shape (M, 2), (M,) and (M,)."""
+        edges = np.array(self.edges, dtype=np.int64).reshape(-1, 2)
+        weights = np.array(self.weights, dtype=np.int64)
+        lengths = np.array(self.lengths, dtype=float)
+        keep = weights >= min_weight
+        return edges[keep], weights[keep], lengths[keep]
+
+    def to_networkx(self, min_weight=1):
+        import networkx as nx
+
+        graph = nx.Graph()
+        for i, (x, y) in enumerate(self.food_locations):
+            graph.add_node(i, x=x, y=y)
+        edges, weights, lengths = self.to_arrays(min_weight)
+        for (a, b), w, l in zip(edges.tolist(), weights.tolist(), lengths.tolist()):
+            graph.add_edge(a, b, weight=w, length=l)
+        return graph
+
+    # sum of edge lengths, either as walked by the nuclei or as straight lines between foods
+    def total_length(self, min_weight=1, euclidean=False):
+        edges, _, lengths = self.to_arrays(min_weight)
+        if euclidean:
+            return float(self._euclidean(edges).sum())
+        return float(lengths.sum())
+
+    def mst_ratio(self, min_weight=1):
+        """Euclidean length of the network divided by the minimum spanning tree of the connected foods."""
+        edges, _, _ = self.to_arrays(min_weight)
+        nodes = np.unique(edges)
+        if len(nodes) < 2:
+            return float("nan")
+        points = np.array(self.food_locations, dtype=float)[nodes]
+        mst = _mst_length(points)
+        return float(self._euclidean(edges).sum() / mst) if mst > 0 else float("nan")
+
+    def fault_tolerance(self, min_weight=1):
+        """Fraction of edges whose removal does not disconnect any pair of connected foods."""
+        edges, _, _ = self.to_arrays(min_weight)
+        if len(edges) == 0:
+            return float("nan")
+        n = len(self.food_locations)
+        # count over the foods of the full network, so a food cut off by a removal still counts
+        nodes = np.unique(edges)
+        components = _count_components(n, edges, nodes)
+        survives = 0
+        for k in range(len(edges)):
+            if _count_components(n, np.delete(edges, k, axis=0), nodes) == components:
+                survives += 1
+        return survives / len(edges)
+
+    def _euclidean(self, edges):
+        points = np.array(self.food_locations, dtype=float).reshape(-1, 2)
+        return np.linalg.norm(points[edges[:, 0]] - points[edges[:, 1]], axis=1)
+
+
+# Prim's algorithm on the complete Euclidean graph of the given points
+def _mst_length(points):
+    n = len(points)
+    in_tree = np.zeros(n, dtype=bool)
+    in_tree[0] = True
+    best = np.linalg.norm(points - points[0], axis=1)
+    total = 0.0
+    for _ in range(n - 1):
+        candidates = np.where(in_tree, np.inf, best)
+        k = int(np.argmin(candidates))
+        total += candidates[k]
+        in_tree[k] = True
+        best = np.minimum(best, np.linalg.norm(points - points[k], axis=1))
+    return total
+
+
+# number of connected components among the given nodes (union-find)
+def _count_components(n, edges, nodes):
+    parent = list(range(n))
+
+    def find(a):
+        while parent[a] != a:
+            parent[a] = parent[parent[a]]
+            a = parent[a]
+        return a
+
+    for a, b in edges.tolist():
+        ra, rb = find(a), find(b)
+        if ra != rb:
+            parent[ra] = rb
+    return len({find(a) for a in nodes.tolist()})
@@ -1,31 +1,104 @@
 import numpy as np
-import pandas as pd
+
+from slime.population import Population
 
 class Nucleus:
-    def __init__(self, x, y, seed):
+    # a nucleus is a view of one row of a Population, which holds the state of all nuclei
+    # in contiguous arrays; without a population it gets one of its own
+    __slots__ = ("population", "index")
+
+    # noise state variables of the original sketch
+    u, v = 0.0, 0.0       # current noise values (taken from somewhere)
+    mapU, mapV = 0.0, 0.0 # mapped noise
+
+    def __init__(self, x, y, seed, dtype=float, population=None):
         # initialize with position and seed 
-        self.location = np.array([x, y], dtype=float)
-        self.acceleration = np.array([0.0, 1.0], dtype=float)  
-        self.velocity = np.array([0.0, 0.0], dtype=float) 
-        self.seed = seed
-        
-        # initialize trail tracking (like the original FloatList x, y)
-        self.trail_x = [x] 
-        self.trail_y = [y]
-        
-        # initialize closest oat tracking
-        self.closest_oat_index = None
-        
-        # initialize noise state variables
-        self.u, self.v = 0.0, 0.0       # current noise values (taken from somewhere)
-        self.nU, self.nV = 0.0, 0.0     # noise position
-        self.mapU, self.mapV = 0.0, 0.0 # mapped noise
+        if population is None:
+            population = Population(dtype, capacity=1)
+        self.population = population
+        self.index = population.add(x, y, seed)
+
+    @property
+    def location(self):
+        return self.population._positions[self.index]
+
+    @location.setter
+    def location(self, value):
+        self.population._positions[self.index] = value
+
+    @property
+    def acceleration(self):
+        return self.population._acceleration[self.index]
+
+    @acceleration.setter
+    def acceleration(self, value):
+        self.population._acceleration[self.index] = value
+
+    @property
+    def seed(self):
+        return int(self.population._seeds[self.index])
+
+    # distance walked since the last food reached
+    @property
+    def path_length(self):
+        return float(self.population._path_length[self.index])
+
+    @path_length.setter
+    def path_length(self, value):
+        self.population._path_length[self.index] = value
+
+    # oats_permanent index of the last food reached
+    @property
+    def last_food_index(self):
+        return _none_if_negative(self.population._last_food[self.index])
+
+    @last_food_index.setter
+    def last_food_index(self, value):
+        self.population._last_food[self.index] = -1 if value is None else value
+
+    @property
+    def closest_oat_index(self):
+        return _none_if_negative(self.population._closest_oat[self.index])
+
+    @closest_oat_index.setter
+    def closest_oat_index(self, value):
+        self.population._closest_oat[self.index] = -1 if value is None else value
+
+    @property
+    def closest_non_attractor_index(self):
+        return _none_if_negative(self.population._closest_non_attractor[self.index])
+
+    # noise position
+    @property
+    def nU(self):
+        return float(self.population._noise_position[self.index])
+
+    nV = nU
+
+    @property
+    def trail_x(self):
+        return self.population.trail(self.index)[0]
+
+    @property
+    def trail_y(self):
+        return self.population.trail(self.index)[1]
+
+    def set_trail(self, trail_x, trail_y):
+        self.population.set_trail(self.index, trail_x, trail_y)
 
     def apply_force(self, force):
         self.acceleration += force
 
     def set_closest_oat(self, idx):
         self.closest_oat_index = idx
+        
+    def set_closest_non_attractor(self, idx):
+        # Method to track closest non-attractor (obstacle)
+        self.population._closest_non_attractor[self.index] = -1 if idx is None else idx
+
+    # the mapped noise vector used by move(), without touching the global random state
+    def noise(self):
+        return self.population._noise[self.index]
 
     def move(self):
         # Perlin noise implementation 
@@ -40,7 +113,7 @@ class Nucleus:
         map_v = (v * 2) - 1
         
         # create velocity vector and apply acceleration 
-        velocity = np.array([map_u, map_v], dtype=float)
+        velocity = np.array([map_u, map_v], dtype=self.location.dtype)
         velocity += self.acceleration
         
         # Set magnitude to 0.5 
@@ -49,20 +122,26 @@ class Nucleus:
         
         # subtract from location (move in opposite direction as in original)
         self.location -= velocity
+        self.path_length += np.linalg.norm(velocity)
         
         # reset acceleration and increment noise values
         self.acceleration *= 0
-        self.nU += 0.01
-        self.nV += 0.01
+        self.population._noise_position[self.index] += 0.01
     
     # record the trail
     def record_trail(self):
         # record the current location in the trail arrays
-        self.trail_x.append(self.location[0])
-        self.trail_y.append(self.location[1])
+        self.add_trail_point(*self.location)
+
+    # append a point (e.g. a food reached) to the trail
+    def add_trail_point(self, x, y):
+        self.population.add_trail_point(self.index, x, y)
 
     # save to csv
     def save_trail(self, id_number):
-        filename = f"{id_number}_Stem_Trail.csv"
-        df = pd.DataFrame({"x": self.trail_x, "y": self.trail_y})
-        df.to_csv(filename, index=False)
+        from slime.export import write_trail_csv
+        write_trail_csv(*self.population.trail(self.index), f"{id_number}_Stem_Trail.csv")
+
+
+def _none_if_negative(value):
+    return None if value < 0 else int(value)
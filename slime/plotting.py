@@ -0,0 +1,34 @@
+import matplotlib.pyplot as plt
+
+# plotting lives here so the simulation core can be imported without matplotlib
+
+
+# static plot of the trails, food and (when the simulation has them) non-attractors
+def plot_simulation(sim, bounds=None):
+    plt.figure(figsize=(8, 8))
+    # draw trails
+    for cell in sim.cells:
+        plt.plot(cell.trail_x, cell.trail_y, alpha=0.5)
+    # draw food
+    for oat in sim.oats_permanent:
+        plt.scatter(oat.location[0], oat.location[1], c="black", s=30)
+    # draw non-attractors as red circles
+    for na in getattr(sim, "non_attractors", []):
+        plt.scatter(na.location[0], na.location[1], c="red", s=50, alpha=0.7)
+        # Draw the repulsion radius
+        circle = plt.Circle((na.location[0], na.location[1]), na.radius, fill=False,
+                            color='red', linestyle='--', alpha=0.3)
+        plt.gca().add_patch(circle)
+
+    if bounds is None:
+        # screen coordinates, y grows downwards
+        plt.xlim(0, sim.width)
+        plt.ylim(0, sim.height)
+        plt.gca().invert_yaxis()
+    else:
+        # map coordinates (xmin, ymin, xmax, ymax)
+        xmin, ymin, xmax, ymax = bounds
+        plt.xlim(xmin, xmax)
+        plt.ylim(ymin, ymax)
+        plt.gca().set_aspect("equal")
+    plt.show()
@@ -0,0 +1,137 @@
+import numpy as np
+
+# State of all nuclei of a simulation in contiguous arrays, one row per nucleus, so a
+# step works on whole arrays instead of looping over Nucleus objects (which are views
+# into a row, see slime.nucleus).
+#
+# Trails are stored as frames: every time the simulation records trails, the positions
+# of all nuclei are copied as one (N, 2) array. Points that only concern one nucleus
+# (the food it reached) are kept per nucleus, tagged with the number of frames recorded
+# before them, and merged in when a trail is read.
+
+_first_uniform = {}
+
+
+# first np.random.uniform(0, 1) after np.random.seed(seed), as drawn by Nucleus.move
+def first_uniform(seed):
+    u = _first_uniform.get(seed)
+    if u is None:
+        u = _first_uniform[seed] = np.random.RandomState(seed).uniform(0, 1)
+    return u
+
+
+class Population:
+    def __init__(self, dtype=float, capacity=64):
+        self.dtype = np.dtype(dtype)
+        self.n = 0
+        self._positions = np.zeros((capacity, 2), self.dtype)
+        self._acceleration = np.zeros((capacity, 2), self.dtype)
+        self._noise = np.zeros((capacity, 2), self.dtype)           # mapped noise used by every move
+        self._path_length = np.zeros(capacity, self.dtype)          # distance walked since the last food
+        self._noise_position = np.zeros(capacity, self.dtype)       # nU / nV of the original sketch
+        self._origin = np.zeros((capacity, 2), self.dtype)          # where the trail starts
+        self._seeds = np.zeros(capacity, np.int32)
+        self._closest_oat = np.full(capacity, -1, np.int32)          # -1 for none
+        self._closest_non_attractor = np.full(capacity, -1, np.int32)
+        self._last_food = np.full(capacity, -1, np.int32)            # oats_permanent index, -1 for none
+        self._trail_start = np.zeros(capacity, np.int32)             # first frame that belongs to the trail
+        self._trail_prefix = {}     # nucleus -> (xs, ys) replacing the origin, see set_trail
+        self._trail_points = {}     # nucleus -> [(frames recorded before it, x, y)]
+        self.frames = []            # recorded positions, (n at the time, 2) each
+
+    def __len__(self):
+        return self.n
+
+    # views of the live rows
+    @property
+    def positions(self):
+        return self._positions[:self.n]
+
+    @property
+    def acceleration(self):
+        return self._acceleration[:self.n]
+
+    @property
+    def noise(self):
+        return self._noise[:self.n]
+
+    @property
+    def path_length(self):
+        return self._path_length[:self.n]
+
+    @property
+    def noise_position(self):
+        return self._noise_position[:self.n]
+
+    @property
+    def seeds(self):
+        return self._seeds[:self.n]
+
+    @property
+    def closest_oat(self):
+        return self._closest_oat[:self.n]
+
+    @property
+    def closest_non_attractor(self):
+        return self._closest_non_attractor[:self.n]
+
+    @property
+    def last_food(self):
+        return self._last_food[:self.n]
+
+    def _grow(self):
+        capacity = 2 * len(self._positions)
+        for name in ("_positions", "_acceleration", "_noise", "_path_length", "_noise_position", "_seeds",
+                     "_closest_oat", "_closest_non_attractor", "_last_food", "_trail_start", "_origin"):
+            old = getattr(self, name)
+            new = np.empty((capacity,) + old.shape[1:], old.dtype)
+            new[:len(old)] = old
+            setattr(self, name, new)
+
+    def add(self, x, y, seed):
+        """Append a nucleus at (x, y) and return its row."""
+        if self.n == len(self._positions):
+            self._grow()
+        i = self.n
+        self.n += 1
+        self._positions[i] = (x, y)
+        self._acceleration[i] = (0.0, 1.0)
+        self._noise[i] = (first_uniform(seed) * 2 - 1, first_uniform(seed + 1) * 2 - 1)
+        self._path_length[i] = 0.0
+        self._noise_position[i] = 0.0
+        self._seeds[i] = seed
+        self._closest_oat[i] = -1
+        self._closest_non_attractor[i] = -1
+        self._last_food[i] = -1
+        self._trail_start[i] = len(self.frames)
+        self._origin[i] = (x, y)
+        return i
+
+    # append the current position of every nucleus to its trail
+    def record_trails(self):
+        self.frames.append(self.positions.copy())
+
+    # append one point to the trail of nucleus i
+    def add_trail_point(self, i, x, y):
+        self._trail_points.setdefault(i, []).append((len(self.frames), x, y))
+
+    def trail(self, i):
+        """``(xs, ys)`` arrays of the trail of nucleus i."""
+        start = self._trail_start[i]
+        prefix_x, prefix_y = self._trail_prefix.get(i, self._origin[i, :, None])
+        recorded = np.array([frame[i] for frame in self.frames[start:]], dtype=self.dtype).reshape(-1, 2)
+        xs = np.concatenate([np.asarray(prefix_x, self.dtype), recorded[:, 0]])
+        ys = np.concatenate([np.asarray(prefix_y, self.dtype), recorded[:, 1]])
+        points = self._trail_points.get(i)
+        if points:
+            # each point goes after the frames recorded before it
+            where = [len(prefix_x) + tag - start for tag, _, _ in points]
+            xs = np.insert(xs, where, [x for _, x, _ in points])
+            ys = np.insert(ys, where, [y for _, _, y in points])
+        return xs, ys
+
+    # replace the trail of nucleus i, e.g. when restoring a cached run
+    def set_trail(self, i, xs, ys):
+        self._trail_prefix[i] = (np.asarray(xs), np.asarray(ys))
+        self._trail_start[i] = len(self.frames)
+        self._trail_points.pop(i, None)
@@ -0,0 +1,158 @@
+import numpy as np
+
+# Compact recording of a run and a replay engine that rebuilds any frame from it
+# without stepping the simulation again.
+#
+# Positions are stored as float32 keyframes plus int16 per-step deltas quantized to
+# 1 / scale units. Each delta is taken against the reconstructed (not the true)
+# previous position, so the quantization error never accumulates: every replayed
+# frame is within 0.5 / scale units of the simulated one. A keyframe is written every
+# keyframe_interval steps and whenever the number of nuclei changes (spawns).
+
+
+class EventLog:
+    def __init__(self, keyframe_interval=1000, scale=1024):
+        self.keyframe_interval = keyframe_interval
+        self.scale = scale
+        self.meta = {}
+        self.keyframe_steps = []
+        self.keyframes = []     # float32 (N, 2) per keyframe
+        self.deltas = []        # per keyframe, list of int16 (N, 2) for the steps that follow it
+        self.reach_events = []      # (step, food, nucleus)
+        self.consumed_events = []   # (step, food)
+        self.spawn_events = []      # (step, x, y, count)
+        self._recon = None
+
+    # static description of the run, stored alongside the frames
+    def set_meta(self, width, height, food):
+        self.meta = {"width": width, "height": height, "food": np.asarray(food, dtype=float).reshape(-1, 2)}
+
+    def record(self, step, positions):
+        """Record the positions of all nuclei after ``step``."""
+        positions = np.asarray(positions, dtype=float).reshape(-1, 2)
+        if self._recon is not None and len(positions) == len(self._recon) \
+                and step - self.keyframe_steps[-1] < self.keyframe_interval:
+            delta = np.rint((positions - self._recon) * self.scale)
+            if np.abs(delta).max(initial=0) <= np.iinfo(np.int16).max:
+                delta = delta.astype(np.int16)
+                self._recon += delta / self.scale
+                self.deltas[-1].append(delta)
+                return
+        keyframe = positions.astype(np.float32)
+        self.keyframe_steps.append(step)
+        self.keyframes.append(keyframe)
+        self.deltas.append([])
+        self._recon = keyframe.astype(float)
+
+    def reach(self, step, food, nucleus):
+        self.reach_events.append((step, food, nucleus))
+
+    def consumed(self, step, food):
+        self.consumed_events.append((step, food))
+
+    def spawn(self, step, x, y, count):
+        self.spawn_events.append((step, x, y, count))
+
+    def save(self, filename):
+        """Write the log as a compressed .npz file."""
+        counts = np.array([len(k) for k in self.keyframes], dtype=np.int64)
+        lengths = np.array([len(d) for d in self.deltas], dtype=np.int64)
+        blocks = [np.asarray(d, dtype=np.int16).reshape(-1, 2) for block in self.deltas for d in block]
+        np.savez_compressed(
+            filename,
+            scale=np.array(self.scale),
+            keyframe_steps=np.array(self.keyframe_steps, dtype=np.int64),
+            keyframe_counts=counts,
+            keyframe_lengths=lengths,
+            keyframes=np.concatenate(self.keyframes) if self.keyframes else np.zeros((0, 2), np.float32),
+            deltas=np.concatenate(blocks) if blocks else np.zeros((0, 2), np.int16),
+            reach_events=np.array(self.reach_events, dtype=np.int64).reshape(-1, 3),
+            consumed_events=np.array(self.consumed_events, dtype=np.int64).reshape(-1, 2),
+            spawn_events=np.array(self.spawn_events, dtype=float).reshape(-1, 4),
+            **{f"meta_{key}": np.asarray(value) for key, value in self.meta.items()},
+        )
+
+
+class Replay:
+    """Random access to the frames of a saved EventLog.
+
+    ``frame(step)`` seeks to the closest keyframe at or before ``step`` and adds
+    the deltas since then; stepping forward from the previous frame only adds the
+    new deltas, so scrubbing through a run costs O(N) per frame.
+    """
+
+    def __init__(self, filename):
+        self.filename = filename
+        with np.load(filename) as data:
+            self.scale = float(data["scale"])
+            self.keyframe_steps = data["keyframe_steps"]
+            counts = data["keyframe_counts"]
+            self.keyframe_lengths = data["keyframe_lengths"]
+            keyframes = data["keyframes"]
+            deltas = data["deltas"]
+            self.reach_events = data["reach_events"]
+            self.consumed_events = data["consumed_events"]
+            self.spawn_events = data["spawn_events"]
+            self.meta = {name[5:]: data[name] for name in data.files if name.startswith("meta_")}
+
+        # split the flat arrays back into one block per keyframe
+        key_offsets = np.concatenate([[0], np.cumsum(counts)])
+        delta_offsets = np.concatenate([[0], np.cumsum(counts * self.keyframe_lengths)])
+        self.keyframes = [keyframes[key_offsets[k]:key_offsets[k + 1]] for k in range(len(counts))]
+        self.deltas = [deltas[delta_offsets[k]:delta_offsets[k + 1]].reshape(-1, counts[k], 2)
+                       for k in range(len(counts))]
+        self._cache = None  # (step, keyframe index, accumulated int deltas)
+
+    # a log saved before the first recorded step still holds the meta data and events
+    def _check_frames(self):
+        if not len(self.keyframe_steps):
+            raise ValueError(f"{self.filename} contains no recorded frames")
+
+    @property
+    def first_step(self):
+        self._check_frames()
+        return int(self.keyframe_steps[0])
+
+    @property
+    def last_step(self):
+        self._check_frames()
+        return int(self.keyframe_steps[-1] + self.keyframe_lengths[-1])
+
+    def frame(self, step):
+        """Positions of all nuclei after ``step``, shape (N, 2)."""
+        self._check_frames()
+        k = int(np.searchsorted(self.keyframe_steps, step, side="right")) - 1
+        if k < 0 or step - self.keyframe_steps[k] > self.keyframe_lengths[k]:
+            raise IndexError(f"step {step} is not in the recording ({self.first_step}-{self.last_step})")
+        m = int(step - self.keyframe_steps[k])
+
+        if self._cache is not None and self._cache[1] == k and self._cache[0] <= step:
+            done = int(self._cache[0] - self.keyframe_steps[k])
+            total = self._cache[2] + self.deltas[k][done:m].sum(axis=0, dtype=np.int64)
+        else:
+            total = self.deltas[k][:m].sum(axis=0, dtype=np.int64)
+        self._cache = (step, k, total)
+        return self.keyframes[k] + total / self.scale
+
+    def frames(self, start=None, stop=None, every=1):
+        """Yield ``(step, positions)`` for consecutive frames."""
+        start = self.first_step if start is None else start
+        stop = self.last_step + 1 if stop is None else stop
+        for step in range(start, stop, every):
+            yield step, self.frame(step)
+
+    def remaining_food(self, step):
+        """Boolean mask over the recorded food of the ones not yet consumed after ``step``."""
+        mask = np.ones(len(self.meta.get("food", [])), dtype=bool)
+        consumed = self.consumed_events[self.consumed_events[:, 0] <= step, 1]
+        mask[consumed] = False
+        return mask
+
+    # events with start <= step < stop
+    def events(self, kind, start=0, stop=None):
+        events = {"reach": self.reach_events, "consumed": self.consumed_events, "spawn": self.spawn_events}[kind]
+        steps = events[:, 0]
+        keep = steps >= start
+        if stop is not None:
+            keep &= steps < stop
+        return events[keep]
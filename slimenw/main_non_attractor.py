@@ -1,3 +1,9 @@
+import sys
+import os
+
+# Add parent directory to path so n_mold can import the slime and slimenw packages
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
 from n_mold import MoldSimulation
 import matplotlib.pyplot as plt
 import numpy as np